@@ -5,8 +5,12 @@ Handles the Dynophore class, describing a dynophore with its superfeatures and e
 partners.
 """
 
+from collections import defaultdict
+from functools import cached_property
 from pathlib import Path
+import json
 import logging
+import os
 
 import numpy as np
 import pandas as pd
@@ -42,7 +46,7 @@ class Dynophore:
         self.superfeatures = []
 
     @classmethod
-    def from_dir(cls, dynophore_path):
+    def from_dir(cls, dynophore_path, cache=False):
         """
         Load dynophore data from DynophoreApp output directory.
 
@@ -50,6 +54,9 @@ class Dynophore:
         ----------
         dynophore_path : pathlib.Path
             Path to DynophoreApp output folder.
+        cache : bool
+            If True, save the parsed data as NPZ file next to the JSON file and load from this
+            file next time, unless the JSON or PML file were modified since. Default is False.
 
         Returns
         -------
@@ -61,8 +68,16 @@ class Dynophore:
 
         if dynophore_path.is_dir():
 
+            # Group files by suffix (scan directory only once, skip non-file entries)
+            filepaths_by_suffix = defaultdict(list)
+            with os.scandir(dynophore_path) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        filepath = Path(entry.path)
+                        filepaths_by_suffix[filepath.suffix].append(filepath)
+
             # Set JSON path
-            json_path = list(dynophore_path.glob("*.json"))
+            json_path = filepaths_by_suffix[".json"]
             if len(json_path) == 1:
                 json_path = json_path[0]
             else:
@@ -71,7 +86,7 @@ class Dynophore:
                 )
 
             # Set PML path
-            pml_path = list(dynophore_path.glob("*.pml"))
+            pml_path = filepaths_by_suffix[".pml"]
             if len(pml_path) == 1:
                 pml_path = pml_path[0]
             else:
@@ -79,8 +94,23 @@ class Dynophore:
                     f"None or roo many PML files in {dynophore_path}. Only one allowed."
                 )
 
-            # Create Dynophore object
-            return cls.from_files(json_path, pml_path)
+            if not cache:
+                return cls.from_files(json_path, pml_path)
+
+            # Use cached NPZ file if it is newer than the JSON and PML files
+            npz_path = json_path.with_suffix(".npz")
+            if npz_path.is_file() and npz_path.stat().st_mtime >= max(
+                json_path.stat().st_mtime, pml_path.stat().st_mtime
+            ):
+                return cls.from_npz(npz_path)
+            logger.info(f"No or outdated NPZ file, parse JSON and PML files: {npz_path}")
+
+            dynophore = cls.from_files(json_path, pml_path)
+            try:
+                dynophore.to_npz(npz_path)
+            except OSError as e:
+                logger.warning(f"Could not write NPZ file, continue without cache: {e}")
+            return dynophore
 
         else:
             raise FileNotFoundError(
@@ -138,9 +168,8 @@ class Dynophore:
                     residue_number = json_envpartner_dict["residue_number"]
                     chain = json_envpartner_dict["chain"]
                 except KeyError:
-                    residue_name = json_envpartner_dict["name"].split("_")[0]
-                    residue_number = json_envpartner_dict["name"].split("_")[1]
-                    chain = json_envpartner_dict["name"].split("_")[2]
+                    name_parts = json_envpartner_dict["name"].split("_")
+                    residue_name, residue_number, chain = name_parts[:3]
                 envpartner_id = json_envpartner_dict["id"]
                 # TODO Remove next line, once updated in DynophoreApp
                 envpartner_id = envpartner_id.replace("_", "-")
@@ -150,8 +179,8 @@ class Dynophore:
                     residue_number,
                     chain,
                     json_envpartner_dict["atom_numbers"],
-                    np.array(json_envpartner_dict["occurrences"]),
-                    np.array(json_envpartner_dict["distances"]),
+                    np.array(json_envpartner_dict["occurrences"], dtype=np.uint8),
+                    np.array(json_envpartner_dict["distances"], dtype=np.float64),
                 )
                 envpartners[envpartner_id] = envpartner
 
@@ -162,16 +191,125 @@ class Dynophore:
                 superfeature_id,
                 json_superfeature_dict["feature_type"],
                 json_superfeature_dict["atom_numbers"],
-                np.array(json_superfeature_dict["occurrences"]),
+                np.array(json_superfeature_dict["occurrences"], dtype=np.uint8),
                 envpartners,
                 cloud,
             )
             superfeatures[superfeature_id] = superfeature
         dynophore.superfeatures = superfeatures
         dynophore.superfeature_ids = list(superfeatures.keys())
+        dynophore._invalidate_cache()
 
         return dynophore
 
+    @classmethod
+    def from_npz(cls, npz_path):
+        """
+        Load dynophore data from NPZ file (written with `Dynophore.to_npz`).
+
+        Parameters
+        ----------
+        npz_path : pathlib.Path
+            Path to dynophore NPZ file.
+
+        Returns
+        -------
+        dynophores.Dynophore
+            Dynophore.
+        """
+
+        dynophore = cls()
+
+        with np.load(Path(npz_path)) as npz:
+
+            metadata = json.loads(str(npz["metadata"]))
+            dynophore.id = metadata["id"]
+
+            superfeatures = {}
+            for i, superfeature_dict in enumerate(metadata["superfeatures"]):
+
+                envpartners = {}
+                for j, envpartner_dict in enumerate(superfeature_dict.pop("envpartners")):
+                    envpartner = EnvPartner(
+                        **envpartner_dict,
+                        occurrences=npz[f"superfeature{i}_envpartner{j}_occurrences"],
+                        distances=npz[f"superfeature{i}_envpartner{j}_distances"],
+                    )
+                    envpartners[envpartner.id] = envpartner
+
+                cloud = ChemicalFeatureCloud3D(
+                    superfeature_dict["id"],
+                    npz[f"superfeature{i}_cloud_center"],
+                    npz[f"superfeature{i}_cloud_points"],
+                )
+
+                superfeature = SuperFeature(
+                    **superfeature_dict,
+                    occurrences=npz[f"superfeature{i}_occurrences"],
+                    envpartners=envpartners,
+                    cloud=cloud,
+                )
+                superfeatures[superfeature.id] = superfeature
+
+        dynophore.superfeatures = superfeatures
+        dynophore.superfeature_ids = list(superfeatures.keys())
+        dynophore._invalidate_cache()
+
+        return dynophore
+
+    def to_npz(self, npz_path):
+        """
+        Save dynophore data to NPZ file, which is much faster to load than the JSON and PML
+        files.
+
+        Parameters
+        ----------
+        npz_path : pathlib.Path
+            Path to dynophore NPZ file.
+        """
+
+        metadata = {"id": self.id, "superfeatures": []}
+        arrays = {}
+
+        for i, superfeature in enumerate(self.superfeatures.values()):
+
+            envpartners_metadata = []
+            for j, envpartner in enumerate(superfeature.envpartners.values()):
+                envpartners_metadata.append(
+                    {
+                        "id": envpartner.id,
+                        "residue_name": envpartner.residue_name,
+                        "residue_number": envpartner.residue_number,
+                        "chain": envpartner.chain,
+                        "atom_numbers": envpartner.atom_numbers,
+                    }
+                )
+                arrays[f"superfeature{i}_envpartner{j}_occurrences"] = envpartner.occurrences
+                arrays[f"superfeature{i}_envpartner{j}_distances"] = envpartner.distances
+
+            metadata["superfeatures"].append(
+                {
+                    "id": superfeature.id,
+                    "feature_type": superfeature.feature_type,
+                    "atom_numbers": superfeature.atom_numbers,
+                    "envpartners": envpartners_metadata,
+                }
+            )
+            arrays[f"superfeature{i}_occurrences"] = superfeature.occurrences
+            arrays[f"superfeature{i}_cloud_center"] = superfeature.cloud.center
+            arrays[f"superfeature{i}_cloud_points"] = superfeature.cloud.points
+
+        # Write to temporary file first, so that an interrupted write leaves no truncated NPZ file
+        npz_path = Path(npz_path)
+        tmp_path = npz_path.with_name(f".{npz_path.name}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(f, metadata=json.dumps(metadata), **arrays)
+            os.replace(tmp_path, npz_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
     @property
     def clouds(self):
         """
@@ -205,7 +343,7 @@ class Dynophore:
 
         return self.superfeatures[superfeature_id].cloud.data
 
-    @property
+    @cached_property
     def superfeatures_occurrences(self):
         """
         Get the superfeatures' occurrences per superfeature and frame.
@@ -216,19 +354,16 @@ class Dynophore:
             Occurrences (0=no, 1=yes) of a superfeature (columns) in each frame (row).
         """
 
-        occurrence_superfeatures = pd.DataFrame(
-            {
-                superfeature_id: superfeature.occurrences
-                for superfeature_id, superfeature in self.superfeatures.items()
-            }
-        ).astype("int32")
-
         # Sort columns by feature type (alphabetically)
-        superfeature_ids = occurrence_superfeatures.columns.to_list()
-        superfeature_ids.sort()
-        occurrence_superfeatures = occurrence_superfeatures[superfeature_ids]
+        superfeature_ids = sorted(self.superfeatures.keys())
 
-        return occurrence_superfeatures
+        occurrence_superfeatures = np.empty(
+            (self.n_frames, len(superfeature_ids)), dtype=np.int32, order="F"
+        )
+        for i, superfeature_id in enumerate(superfeature_ids):
+            occurrence_superfeatures[:, i] = self.superfeatures[superfeature_id].occurrences
+
+        return pd.DataFrame(occurrence_superfeatures, columns=superfeature_ids)
 
     def envpartners_occurrences_by_superfeature(self, superfeature_id):
         """
@@ -250,7 +385,7 @@ class Dynophore:
         superfeature = self.superfeatures[superfeature_id]
         return superfeature.envpartners_occurrences
 
-    @property
+    @cached_property
     def envpartners_occurrences(self):
         """
         For each superfeature, get its environmental partners' occurrences per environmental
@@ -288,7 +423,7 @@ class Dynophore:
         superfeature = self.superfeatures[superfeature_id]
         return superfeature.envpartners_distances
 
-    @property
+    @cached_property
     def envpartners_distances(self):
         """
         For each superfeature, get its environmental partners' distances per environmental
@@ -319,7 +454,7 @@ class Dynophore:
 
         return len(self.superfeatures)
 
-    @property
+    @cached_property
     def n_frames(self):
         """
         Get dynophore's number of frames.
@@ -333,7 +468,7 @@ class Dynophore:
         superfeature = next(iter(self.superfeatures.values()))
         return len(superfeature.occurrences)
 
-    @property
+    @cached_property
     def count(self):
         """
         Get number of frames in which each dynophore occurs, including the superfeatures and
@@ -346,18 +481,33 @@ class Dynophore:
             each single environmental partner as well as any environmental partner (columns).
         """
 
-        dynophore_count = pd.DataFrame(
-            {
-                superfeature_id: superfeature.count
-                for superfeature_id, superfeature in self.superfeatures.items()
-            }
+        # Rows: "any" plus environmental partner IDs; same order as pandas' index union, i.e.
+        # kept as is if all superfeatures share the same IDs, else union sorted alphabetically
+        ids_per_superfeature = [
+            ["any"] + list(superfeature.envpartners.keys())
+            for superfeature in self.superfeatures.values()
+        ]
+        if ids_per_superfeature and all(
+            ids == ids_per_superfeature[0] for ids in ids_per_superfeature
+        ):
+            envpartner_ids = ids_per_superfeature[0]
+        else:
+            envpartner_ids = sorted(set().union(*ids_per_superfeature))
+        envpartner_ix = {envpartner_id: i for i, envpartner_id in enumerate(envpartner_ids)}
+
+        dynophore_count = np.zeros(
+            (len(envpartner_ids), len(self.superfeatures)), dtype=np.int32, order="F"
         )
-        dynophore_count.fillna(0, inplace=True)
-        dynophore_count = dynophore_count.astype("int32")
+        for i, superfeature in enumerate(self.superfeatures.values()):
+            dynophore_count[envpartner_ix["any"], i] = np.count_nonzero(superfeature.occurrences)
+            for envpartner_id, envpartner in superfeature.envpartners.items():
+                dynophore_count[envpartner_ix[envpartner_id], i] = envpartner.count
 
-        return dynophore_count
+        return pd.DataFrame(
+            dynophore_count, index=envpartner_ids, columns=list(self.superfeatures.keys())
+        )
 
-    @property
+    @cached_property
     def frequency(self):
         """
         Get frequency of frames in which each dynophore occurs, including the superfeatures and
@@ -370,7 +520,29 @@ class Dynophore:
             to each single environmental partner as well as any environmental partner (columns).
         """
 
-        return self.count.apply(lambda x: round(x / self.n_frames * 100, 2))
+        dynophore_count = self.count
+        dynophore_frequency = np.round(
+            dynophore_count.to_numpy(dtype=np.float64) / self.n_frames * 100, 2
+        )
+
+        return pd.DataFrame(
+            dynophore_frequency, index=dynophore_count.index, columns=dynophore_count.columns
+        )
+
+    def _invalidate_cache(self):
+        """
+        Reset all cached properties, e.g. after (re)setting the dynophore's superfeatures.
+        """
+
+        for name in [
+            "superfeatures_occurrences",
+            "envpartners_occurrences",
+            "envpartners_distances",
+            "n_frames",
+            "count",
+            "frequency",
+        ]:
+            self.__dict__.pop(name, None)
 
     def _raise_keyerror_if_invalid_superfeature_id(self, superfeature_id):
         """
@@ -382,7 +554,7 @@ class Dynophore:
             Superfeature ID
         """
 
-        if superfeature_id not in self.envpartners_occurrences.keys():
+        if superfeature_id not in self.superfeatures:
             raise KeyError(f"Superfeature ID {superfeature_id} is unknown.")
 
     def _superfeature_ids_frequencies_strings(self, superfeature_ids):
@@ -402,11 +574,10 @@ class Dynophore:
         """
 
         superfeature_ids_frequencies = round(self.frequency.loc["any", superfeature_ids], 1)
-        superfeature_ids_frequencies_strings = (
-            superfeature_ids_frequencies.reset_index()
-            .apply(lambda x: f"{x['index']} {x['any']}%", axis=1)
-            .to_list()
-        )
+        superfeature_ids_frequencies_strings = [
+            f"{superfeature_id} {frequency}%"
+            for superfeature_id, frequency in superfeature_ids_frequencies.items()
+        ]
         return superfeature_ids_frequencies_strings
 
     def _envpartner_names_frequencies_strings(self, superfeature_id, envpartners_names):
@@ -420,10 +591,9 @@ class Dynophore:
             envpartners_occurrences.sum() / envpartners_occurrences.shape[0] * 100, 1
         )
         envpartner_names_frequencies = envpartner_names_frequencies[envpartners_names]
-        envpartner_names_frequencies_strings = (
-            envpartner_names_frequencies.reset_index()
-            .apply(lambda x: f"{x['index']} {x[0]}%", axis=1)
-            .to_list()
-        )
+        envpartner_names_frequencies_strings = [
+            f"{envpartner_name} {frequency}%"
+            for envpartner_name, frequency in envpartner_names_frequencies.items()
+        ]
 
         return envpartner_names_frequencies_strings
@@ -4,6 +4,8 @@ dynophores.core.envpartner
 Handles the EnvPartner class, which describes one environmental partner for one superfeature.
 """
 
+import numpy as np
+
 
 class EnvPartner:
     """
@@ -27,6 +29,16 @@ class EnvPartner:
         Interaction distances in each frame.
     """
 
+    __slots__ = (
+        "id",
+        "residue_name",
+        "residue_number",
+        "chain",
+        "atom_numbers",
+        "occurrences",
+        "distances",
+    )
+
     def __init__(
         self, id, residue_name, residue_number, chain, atom_numbers, occurrences, distances
     ):
@@ -66,7 +78,7 @@ class EnvPartner:
             Count of interaction occurrence.
         """
 
-        return sum(self.occurrences)
+        return int(np.count_nonzero(self.occurrences))
 
     @property
     def frequency(self):
@@ -79,4 +91,4 @@ class EnvPartner:
             Frequency of interaction occurrence.
         """
 
-        return round(sum(self.occurrences) / self.n_frames * 100, 2)
+        return round(self.count / self.n_frames * 100, 2)
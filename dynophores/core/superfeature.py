@@ -4,6 +4,9 @@ dynophores.core.superfeature
 Handles the SuperFeature class, which describes one superfeature for one dynophore.
 """
 
+from functools import cached_property
+
+import numpy as np
 import pandas as pd
 
 
@@ -53,7 +56,7 @@ class SuperFeature:
 
         """
 
-        return self._data(type="occurrences").astype("int32")
+        return self._data(type="occurrences")
 
     @property
     def envpartners_distances(self):
@@ -82,7 +85,7 @@ class SuperFeature:
 
         return len(self.occurrences)
 
-    @property
+    @cached_property
     def count(self):
         """
         Get number of frames in which the superfeature occurs, including the superfeature's
@@ -95,17 +98,19 @@ class SuperFeature:
             environmental partner as well as any environmental partner.
         """
 
-        superfeature_count = pd.Series({"any": sum(self.occurrences)})
+        superfeature_count = pd.Series({"any": int(np.count_nonzero(self.occurrences))})
         envpartners_count = pd.Series(
-            {
-                envpartner_id: envpartner.count
-                for envpartner_id, envpartner in self.envpartners.items()
-            }
+            np.fromiter(
+                (envpartner.count for envpartner in self.envpartners.values()),
+                dtype=np.int32,
+                count=len(self.envpartners),
+            ),
+            index=list(self.envpartners.keys()),
         )
 
-        return superfeature_count.append(envpartners_count)
+        return pd.concat([superfeature_count, envpartners_count])
 
-    @property
+    @cached_property
     def frequency(self):
         """
         Get frequency of frames in which the superfeature occurs, including the superfeature's
@@ -118,7 +123,7 @@ class SuperFeature:
             environmental partner as well as any environmental partner.
         """
 
-        return self.count.apply(lambda x: round(x / self.n_frames * 100, 2))
+        return (self.count / self.n_frames * 100).round(2)
 
     def _data(self, type="occurrences"):
         """
@@ -136,15 +141,15 @@ class SuperFeature:
             (columns) for all frames (rows).
         """
 
-        types = ["occurrences", "distances"]
+        types = {"occurrences": np.int32, "distances": np.float64}
         if type in types:
             pass
         else:
             raise KeyError(f'Wrong type. Select from: {", ".join(types)}')
 
-        return pd.DataFrame(
-            {
-                envpartner_id: getattr(envpartner, type)
-                for envpartner_id, envpartner in self.envpartners.items()
-            }
-        )
+        # Fill preallocated array column by column (Fortran order: columns are contiguous)
+        data = np.empty((self.n_frames, len(self.envpartners)), dtype=types[type], order="F")
+        for i, envpartner in enumerate(self.envpartners.values()):
+            data[:, i] = getattr(envpartner, type)
+
+        return pd.DataFrame(data, columns=list(self.envpartners.keys()))
@@ -28,8 +28,7 @@ def _json_to_dict(json_path):
     """
 
     with open(json_path, "r") as f:
-        json_string = f.read()
-        dynophore_dict = json.loads(json_string)
+        dynophore_dict = json.load(f)
 
     return dynophore_dict
 
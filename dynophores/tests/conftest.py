@@ -88,6 +88,54 @@ def superfeature():
     return superfeature
 
 
+@pytest.fixture(scope="module")
+def superfeature_factory():
+    """
+    Create superfeatures from occurrences (used for superfeature and environmental partners).
+    """
+
+    def _superfeature(
+        occurrences, envpartner_ids=("ILE-10-A[169,171,172]",), superfeature_id="H[4599]"
+    ):
+
+        occurrences = np.array(occurrences, dtype=np.uint8)
+        envpartners = {
+            envpartner_id: EnvPartner(
+                envpartner_id, "ILE", 10, "A", [169], occurrences, np.ones(occurrences.size)
+            )
+            for envpartner_id in envpartner_ids
+        }
+        cloud = ChemicalFeatureCloud3D(superfeature_id, np.zeros(3), np.zeros((1, 3)))
+
+        superfeature = SuperFeature(
+            superfeature_id,
+            superfeature_id.split("[")[0],
+            [4599],
+            occurrences,
+            envpartners,
+            cloud,
+        )
+        return superfeature
+
+    return _superfeature
+
+
+@pytest.fixture(scope="module")
+def dynophore_factory():
+    """
+    Create dynophores from superfeatures.
+    """
+
+    def _dynophore(superfeatures):
+
+        dynophore = Dynophore()
+        dynophore.superfeatures = {superfeature.id: superfeature for superfeature in superfeatures}
+        dynophore.superfeature_ids = list(dynophore.superfeatures.keys())
+        return dynophore
+
+    return _dynophore
+
+
 @pytest.fixture(scope="module")
 def dynophore():
 
@@ -5,6 +5,7 @@ Uses fixture tests.conftest.dynophore.
 """
 
 from pathlib import Path
+import os
 
 import pytest
 
@@ -13,6 +14,10 @@ from dynophores import Dynophore, SuperFeature
 PATH_TEST_DATA = Path(__name__).parent / "dynophores" / "tests" / "data"
 
 
+def raise_error(*args, **kwargs):
+    raise OSError("Not allowed in this test.")
+
+
 class TestsDynophore:
     """
     Test Dynophore class methods.
@@ -34,6 +39,68 @@ class TestsDynophore:
         dynophore = Dynophore.from_dir(filepath)
         assert isinstance(dynophore, Dynophore)
 
+    def test_to_npz_from_npz(self, dynophore, tmp_path):
+
+        npz_path = tmp_path / "dynophore.npz"
+        dynophore.to_npz(npz_path)
+        dynophore_npz = Dynophore.from_npz(npz_path)
+        assert isinstance(dynophore_npz, Dynophore)
+        assert dynophore_npz.id == dynophore.id
+        assert dynophore_npz.superfeature_ids == dynophore.superfeature_ids
+        assert dynophore_npz.superfeatures_occurrences.equals(dynophore.superfeatures_occurrences)
+        assert dynophore_npz.envpartners_distances.keys() == dynophore.envpartners_distances.keys()
+        for superfeature_id, distances in dynophore.envpartners_distances.items():
+            assert dynophore_npz.envpartners_distances[superfeature_id].equals(distances)
+
+    @pytest.mark.parametrize("filepath", [PATH_TEST_DATA / "out"])
+    def test_from_dir_cache(self, filepath, tmp_path, monkeypatch):
+
+        for path in filepath.glob("*"):
+            (tmp_path / path.name).write_bytes(path.read_bytes())
+        npz_path = tmp_path / "1KE7_dynophore.npz"
+
+        dynophore = Dynophore.from_dir(tmp_path, cache=True)
+        assert npz_path.is_file()
+
+        # Up-to-date NPZ file: JSON and PML files must not be parsed
+        from_files = Dynophore.from_files
+        with monkeypatch.context() as m:
+            m.setattr(Dynophore, "from_files", raise_error)
+            dynophore_cached = Dynophore.from_dir(tmp_path, cache=True)
+        assert dynophore_cached.id == dynophore.id
+        assert dynophore_cached.count.equals(dynophore.count)
+
+        # Outdated NPZ file (older than JSON file): JSON and PML files must be parsed again
+        json_mtime = (tmp_path / "1KE7_dynophore.json").stat().st_mtime
+        os.utime(npz_path, (json_mtime - 10, json_mtime - 10))
+        calls = []
+
+        def from_files_counted(cls, *args):
+            calls.append(args)
+            return from_files(*args)
+
+        with monkeypatch.context() as m:
+            m.setattr(Dynophore, "from_files", classmethod(from_files_counted))
+            dynophore_parsed = Dynophore.from_dir(tmp_path, cache=True)
+        assert len(calls) == 1
+        assert dynophore_parsed.count.equals(dynophore.count)
+
+        # Rewritten NPZ file is up-to-date again
+        with monkeypatch.context() as m:
+            m.setattr(Dynophore, "from_files", raise_error)
+            Dynophore.from_dir(tmp_path, cache=True)
+
+    @pytest.mark.parametrize("filepath", [PATH_TEST_DATA / "out"])
+    def test_from_dir_cache_write_fails(self, filepath, tmp_path, monkeypatch):
+
+        for path in filepath.glob("*"):
+            (tmp_path / path.name).write_bytes(path.read_bytes())
+
+        monkeypatch.setattr(Dynophore, "to_npz", raise_error)
+        dynophore = Dynophore.from_dir(tmp_path, cache=True)
+        assert isinstance(dynophore, Dynophore)
+        assert not (tmp_path / "1KE7_dynophore.npz").exists()
+
     @pytest.mark.parametrize(
         "column_names, counts_sum",
         [
@@ -190,6 +257,44 @@ class TestsDynophore:
         assert dynophore.frequency.index.to_list() == envpartner_names
         assert pytest.approx(dynophore.frequency.sum().sum()) == frequency_sum
 
+    @pytest.mark.parametrize(
+        "n_frames, count, frequency",
+        [(96, 15, 15.62), (96, 27, 28.12)],  # Frequency depends on operation order
+    )
+    def test_frequency_rounding(
+        self, superfeature_factory, dynophore_factory, n_frames, count, frequency
+    ):
+
+        superfeature = superfeature_factory([1] * count + [0] * (n_frames - count))
+        dynophore = dynophore_factory([superfeature])
+        assert dynophore.frequency[superfeature.id].to_list() == [frequency, frequency]
+
+    @pytest.mark.parametrize(
+        "envpartner_ids_per_superfeature, envpartner_ids",
+        [
+            # Identical environmental partners: Keep order
+            ([["ZZZ", "AAA"]], ["any", "ZZZ", "AAA"]),
+            ([["ZZZ", "AAA"], ["ZZZ", "AAA"]], ["any", "ZZZ", "AAA"]),
+            # Different environmental partners: Sort union
+            ([["ZZZ", "AAA"], ["BBB"]], ["AAA", "BBB", "ZZZ", "any"]),
+        ],
+    )
+    def test_count_order(
+        self,
+        superfeature_factory,
+        dynophore_factory,
+        envpartner_ids_per_superfeature,
+        envpartner_ids,
+    ):
+
+        superfeatures = [
+            superfeature_factory([0, 1, 1], ids, superfeature_id=f"H[{i}]")
+            for i, ids in enumerate(envpartner_ids_per_superfeature)
+        ]
+        dynophore = dynophore_factory(superfeatures)
+        assert dynophore.count.index.to_list() == envpartner_ids
+        assert dynophore.frequency.index.to_list() == envpartner_ids
+
     @pytest.mark.parametrize(
         "valid_superfeature, superfeature_id",
         [(True, "AR[4605,4607,4603,4606,4604]"), (False, "xxx")],
@@ -203,3 +308,13 @@ class TestsDynophore:
         else:
             with pytest.raises(KeyError):
                 dynophore._raise_keyerror_if_invalid_superfeature_id(superfeature_id)
+
+    @pytest.mark.parametrize("filepath", [PATH_TEST_DATA / "out"])
+    def test_invalidate_cache(self, filepath):
+
+        dynophore = Dynophore.from_dir(filepath)
+        count = dynophore.count
+        assert dynophore.count is count
+        dynophore._invalidate_cache()
+        assert dynophore.count is not count
+        assert dynophore.count.equals(count)
@@ -33,6 +33,7 @@ class TestsEnvPartner:
 
         envpartner = EnvPartner(**envpartner_dict)
         assert isinstance(envpartner, EnvPartner)
+        assert not hasattr(envpartner, "__dict__")
 
     @pytest.mark.parametrize(
         "envpartner_dict",
@@ -58,3 +58,12 @@ class TestsSuperFeature:
         frequency = pd.Series(frequency, index=["any"] + envpartner_ids)
         frequency = round(frequency * 100, 2)
         assert all(superfeature.frequency == frequency)
+
+    @pytest.mark.parametrize(
+        "n_frames, count, frequency",
+        [(96, 15, 15.62), (96, 27, 28.12)],  # Frequency depends on operation order
+    )
+    def test_frequency_rounding(self, superfeature_factory, n_frames, count, frequency):
+
+        superfeature = superfeature_factory([1] * count + [0] * (n_frames - count))
+        assert superfeature.frequency.to_list() == [frequency, frequency]
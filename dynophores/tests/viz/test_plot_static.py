@@ -6,6 +6,7 @@ Will only test if static plotting raises errors.
 
 import pytest
 import matplotlib
+import pandas as pd
 
 from dynophores.viz import plot
 
@@ -153,3 +154,19 @@ def test_envpartners_all_in_one_raises(dynophore, superfeature_id):
 
     with pytest.raises(KeyError):
         plot.static.envpartners_all_in_one(dynophore, superfeature_id)
+
+
+@pytest.mark.parametrize(
+    "ix_range, ix_step_size, ix_selected",
+    [
+        ([0, None], 1, list(range(0, 10))),
+        ([0, None], 3, [0, 3, 6, 9]),
+        ([2, 5], 1, [2, 3, 4, 5]),
+        ([2, 8], 4, [2, 6]),
+    ],
+)
+def test_slice_dataframe_rows(ix_range, ix_step_size, ix_selected):
+
+    dataframe = pd.DataFrame({"a": range(0, 10)})
+    dataframe = plot.static._slice_dataframe_rows(dataframe, ix_range, ix_step_size)
+    assert dataframe.index.to_list() == ix_selected
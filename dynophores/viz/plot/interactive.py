@@ -96,7 +96,7 @@ def superfeatures_occurrences(dynophore):
         ),
         frame_step_size=widgets.BoundedIntText(
             # Default value results in displayed 1000 frames
-            value=math.floor(dynophore.n_frames / 1000),
+            value=max(1, math.floor(dynophore.n_frames / 1000)),
             min=1,
             max=dynophore.n_frames - 1,
             step=1,
@@ -147,7 +147,7 @@ def envpartners_occurrences(dynophore):
         ),
         frame_step_size=widgets.BoundedIntText(
             # Default value results in displayed 1000 frames
-            value=math.floor(dynophore.n_frames / 1000),
+            value=max(1, math.floor(dynophore.n_frames / 1000)),
             min=1,
             max=dynophore.n_frames - 1,
             step=1,
@@ -204,7 +204,7 @@ def envpartners_distances(dynophore):
         ),
         frame_step_size=widgets.BoundedIntText(
             # Default value results in displayed 1000 frames
-            value=math.floor(dynophore.n_frames / 1000),
+            value=max(1, math.floor(dynophore.n_frames / 1000)),
             min=1,
             max=dynophore.n_frames - 1,
             step=1,
@@ -256,7 +256,7 @@ def envpartners_all_in_one(dynophore):
         ),
         frame_step_size=widgets.BoundedIntText(
             # Default value results in displayed 1000 frames
-            value=math.floor(dynophore.n_frames / 1000),
+            value=max(1, math.floor(dynophore.n_frames / 1000)),
             min=1,
             max=dynophore.n_frames - 1,
             step=1,
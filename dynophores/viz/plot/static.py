@@ -2,8 +2,8 @@
 Contains static plotting functions.
 """
 
+from functools import wraps
 import math
-import itertools
 
 import numpy as np
 import pandas as pd
@@ -12,9 +12,25 @@ import seaborn as sns
 
 from dynophores.definitions import FEATURE_COLORS
 
-plt.style.use("seaborn")
+# Matplotlib 3.6 renamed the seaborn styles (old names were removed in 3.8)
+PLOT_STYLE = "seaborn-v0_8" if "seaborn-v0_8" in plt.style.available else "seaborn"
 
 
+def _plot_style(plot_function):
+    """
+    Apply the plot style only while the decorated plotting function runs (instead of changing
+    matplotlib's global style on import).
+    """
+
+    @wraps(plot_function)
+    def wrapper(*args, **kwargs):
+        with plt.style.context(PLOT_STYLE):
+            return plot_function(*args, **kwargs)
+
+    return wrapper
+
+
+@_plot_style
 def superfeatures_vs_envpartners(dynophore, superfeature_ids="all"):
     """
     Plot heatmap of interactions between superfeatures and interaction partners.
@@ -55,6 +71,7 @@ def superfeatures_vs_envpartners(dynophore, superfeature_ids="all"):
     return fig, ax
 
 
+@_plot_style
 def superfeatures_occurrences(
     dynophore,
     superfeature_ids="all",
@@ -99,16 +116,14 @@ def superfeatures_occurrences(
 
     # Feature type colors?
     if color_by_feature_type:
-        feature_types = [i.split("[")[0] for i in data.columns]
-        colors = [
-            FEATURE_COLORS[i] if i in FEATURE_COLORS.keys() else "black" for i in feature_types
-        ]
+        feature_types = [i.partition("[")[0] for i in data.columns]
+        colors = [FEATURE_COLORS.get(i, "black") for i in feature_types]
     else:
         colors = "black"
 
     # Plot (plot size depending on number barcodes)
     fig, ax = plt.subplots(figsize=(10, data.shape[1] / 2))
-    data.plot(marker=".", markersize=5, linestyle="", legend=None, ax=ax, color=colors)
+    _plot_occurrences(data, ax, colors)
     # Set y tick labels
     ax.set_yticks(range(0, data.shape[1] + 2))
     superfeature_labels = dynophore._superfeature_ids_frequencies_strings(data.columns.to_list())
@@ -121,6 +136,7 @@ def superfeatures_occurrences(
     return fig, ax
 
 
+@_plot_style
 def envpartners_occurrences(
     dynophore,
     superfeature_ids,
@@ -180,14 +196,7 @@ def envpartners_occurrences(
             ax.set_yticks([0])
             ax.set_yticklabels([""])
         else:
-            data.plot(
-                marker=".",
-                markersize=5,
-                linestyle="",
-                legend=None,
-                ax=ax,
-                color="black",
-            )
+            _plot_occurrences(data, ax, "black")
             # Set y tick labels
             ax.set_yticks(range(0, data.shape[1] + 2))
             envpartner_labels = dynophore._envpartner_names_frequencies_strings(
@@ -202,6 +211,7 @@ def envpartners_occurrences(
     return fig, axes
 
 
+@_plot_style
 def envpartners_distances(
     dynophore, superfeature_ids, kind="line", frame_range=[0, None], frame_step_size=1
 ):
@@ -281,6 +291,7 @@ def envpartners_distances(
     return fig, axes
 
 
+@_plot_style
 def envpartners_all_in_one(dynophore, superfeature_id, frame_range=[0, None], frame_step_size=1):
     """
     Plot interaction data for a superfeature, i.e. occurrences (frame series) and distances
@@ -316,7 +327,9 @@ def envpartners_all_in_one(dynophore, superfeature_id, frame_range=[0, None], fr
     occurrences = dynophore.envpartners_occurrences_by_superfeature(superfeature_id)
     distances = dynophore.envpartners_distances_by_superfeature(superfeature_id)
     occurrences = _prepare_dataframe_for_plotting(occurrences, frame_range, frame_step_size)
-    distances = _prepare_dataframe_for_plotting(distances, frame_range, frame_step_size)
+    distances = _prepare_dataframe_for_plotting(
+        distances, frame_range, frame_step_size, is_occurrences=False
+    )
 
     # Set up plot
     fig, axes = plt.subplots(
@@ -329,7 +342,13 @@ def envpartners_all_in_one(dynophore, superfeature_id, frame_range=[0, None], fr
     )
 
     # Subplot (0, 0): Interaction occurrences (barplot)
-    occurrences.plot(ax=axes[0][0], kind="line", legend=None, marker=".", linestyle="")
+    # Use default color cycle to match colors of distance plots
+    _plot_occurrences(
+        occurrences,
+        axes[0][0],
+        [f"C{i}" for i in range(occurrences.shape[1])],
+        markersize=plt.rcParams["lines.markersize"],
+    )
     # Set y tick labels (tick per envpartner but do not show label)
     axes[0][0].set_yticks(range(0, occurrences.shape[1] + 2))
     axes[0][0].set_yticklabels("")
@@ -368,6 +387,37 @@ def envpartners_all_in_one(dynophore, superfeature_id, frame_range=[0, None], fr
     return fig, axes
 
 
+def _plot_occurrences(dataframe, ax, colors, markersize=5):
+    """
+    Plot occurrences as barcode with one scatter call (instead of one line per column).
+
+    Parameters
+    ----------
+    dataframe : pandas.DataFrame
+        Occurrences of superfeatures/envpartners (columns) over trajectory frames (rows),
+        transformed to ranks in plot (see `_prepare_dataframe_for_plotting`).
+    ax : matplotlib.axis.Subplot
+        Plot axes.
+    colors : str or list of str
+        One color for all columns or one color per column.
+    markersize : int or float
+        Marker size (in points, as in `matplotlib.pyplot.plot`).
+    """
+
+    values = dataframe.to_numpy()
+    rows, columns = np.nonzero(~np.isnan(values))
+    if not isinstance(colors, str):
+        colors = np.asarray(colors)[columns]
+    ax.scatter(
+        dataframe.index.to_numpy()[rows],
+        values[rows, columns],
+        s=markersize**2,
+        c=colors,
+        marker=".",
+        linewidths=0,
+    )
+
+
 def _prepare_dataframe_for_plotting(
     dataframe, frame_range=[0, None], frame_step_size=1, is_occurrences=True
 ):
@@ -386,8 +436,8 @@ def _prepare_dataframe_for_plotting(
         Define frame slicing by step size. Default is 1, i.e. every frame will be selected.
         If e.g. step size is 10, every 10th frame will be selected.
     is_occurrence : bool
-        If DataFrame contains occurrences data (0/1), all 0s will be set to None and all 1 per
-        column will be set to the rank in the plot.
+        If DataFrame contains occurrences data (0/1), the DataFrame is cast to float, all 0s
+        will be set to NaN and all 1 per column will be set to the rank in the plot.
 
     Returns
     -------
@@ -396,21 +446,20 @@ def _prepare_dataframe_for_plotting(
     """
 
     # Sort columns by superfeature/envpartner frequency
-    sorted_columns = dataframe.apply(sum).sort_values(ascending=False).index
-    dataframe = dataframe[sorted_columns]
+    column_order = np.argsort(-dataframe.to_numpy().sum(axis=0), kind="stable")
+    dataframe = dataframe.iloc[:, column_order]
 
     # Slice rows
     dataframe = _slice_dataframe_rows(dataframe, frame_range, frame_step_size)
 
-    # If data describes occurrences, replace 0 with None and transform 1 to rank position in plot
-
-    # Transform 1 in binary values to rank in plot
+    # If data describes occurrences, replace 0 with NaN and transform 1 to rank position in plot
     if is_occurrences:
-        dataframe_plot = {}
-        for i, (name, data) in enumerate(dataframe.items()):
-            data = data.replace([0, 1], [None, i + 1])
-            dataframe_plot[name] = data
-        dataframe = pd.DataFrame(dataframe_plot)
+        ranks = np.arange(1, dataframe.shape[1] + 1, dtype=np.float64)
+        dataframe = pd.DataFrame(
+            np.where(dataframe.to_numpy() == 1, ranks[np.newaxis, :], np.nan),
+            index=dataframe.index,
+            columns=dataframe.columns,
+        )
 
     return dataframe
 
@@ -437,8 +486,7 @@ def _slice_dataframe_rows(dataframe, ix_range, ix_step_size):
         ix_end = dataframe.shape[0]
     ix_end = ix_end + 1
 
-    selected_indices = itertools.islice(dataframe.index, ix_start, ix_end, ix_step_size)
-    dataframe = dataframe.iloc[list(selected_indices), :]
+    dataframe = dataframe.iloc[ix_start:ix_end:ix_step_size, :]
 
     return dataframe
 
@@ -49,7 +49,7 @@ setup(
     #            'Mac OS-X',
     #            'Unix',
     #            'Windows'],            # Valid platforms your code works on, adjust to your flavor
-    # python_requires=">=3.5",          # Python version restrictions
+    python_requires=">=3.8",  # functools.cached_property
     # Manual control if final package is compressible or not, set False to prevent the .egg from being made
     # zip_safe=False,
 )